@@ -587,7 +587,8 @@ class CandleFetcher:
 
         if self._mode == "rest":
             import requests  # local import
-            self._requests = requests
+            # keep-alive session: chart refreshes hit the same KuCoin host over and over
+            self._requests = requests.Session()
 
         # Small in-memory cache to keep timeframe switching snappy.
         # key: (pair, timeframe, limit) -> (saved_time_epoch, candles)
@@ -1181,6 +1182,10 @@ class AccountValueChart(ttk.Frame):
         self.max_points = min(int(max_points or 0) or 250, 250)
         self._last_mtime: Optional[float] = None
 
+        # The history file is append-only: keep what was already parsed and only read new bytes.
+        self._hist_offset = 0
+        self._hist_points: List[Tuple[float, float]] = []
+
 
         top = ttk.Frame(self)
         top.pack(fill="x", padx=6, pady=6)
@@ -1285,28 +1290,44 @@ class AccountValueChart(ttk.Frame):
 
         try:
             if os.path.isfile(path):
-                # Read the FULL history so the chart shows from the very beginning
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.read().splitlines()
+                # The chart shows the FULL history from the very beginning, but only the
+                # complete lines appended since the last refresh are read and parsed.
+                if os.path.getsize(path) < self._hist_offset:
+                    # File was truncated/replaced -> start over
+                    self._hist_offset = 0
+                    self._hist_points = []
+
+                with open(path, "rb") as f:
+                    f.seek(self._hist_offset)
+                    chunk = f.read()
+
+                end = chunk.rfind(b"\n")
+                if end >= 0:
+                    self._hist_offset += end + 1
+
+                    for ln in chunk[:end + 1].splitlines():
+                        try:
+                            obj = json.loads(ln)
+                            ts = obj.get("ts", None)
+                            v = obj.get("total_account_value", None)
+                            if ts is None or v is None:
+                                continue
 
-                for ln in lines:
-                    try:
-                        obj = json.loads(ln)
-                        ts = obj.get("ts", None)
-                        v = obj.get("total_account_value", None)
-                        if ts is None or v is None:
-                            continue
+                            tsf = float(ts)
+                            vf = float(v)
 
-                        tsf = float(ts)
-                        vf = float(v)
+                            # Drop obviously invalid points early
+                            if (not math.isfinite(tsf)) or (not math.isfinite(vf)) or (vf <= 0.0):
+                                continue
 
-                        # Drop obviously invalid points early
-                        if (not math.isfinite(tsf)) or (not math.isfinite(vf)) or (vf <= 0.0):
+                            self._hist_points.append((tsf, vf))
+                        except Exception:
                             continue
 
-                        points.append((tsf, vf))
-                    except Exception:
-                        continue
+                points = list(self._hist_points)
+            else:
+                self._hist_offset = 0
+                self._hist_points = []
         except Exception:
             points = []
 
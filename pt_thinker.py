@@ -165,10 +165,10 @@ def _load_gui_coins() -> list:
 	Caches by mtime so it is cheap to call frequently.
 	"""
 	try:
-		if not os.path.isfile(_GUI_SETTINGS_PATH):
+		try:
+			mtime = os.stat(_GUI_SETTINGS_PATH).st_mtime
+		except OSError:
 			return list(_gui_settings_cache["coins"])
-
-		mtime = os.path.getmtime(_GUI_SETTINGS_PATH)
 		if _gui_settings_cache["mtime"] == mtime:
 			return list(_gui_settings_cache["coins"])
 
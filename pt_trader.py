@@ -1,19 +1,45 @@
 import base64
-import datetime
 import json
 import uuid
 import time
 import math
+import bisect
+import re
+from operator import itemgetter
 from typing import Any, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from nacl.signing import SigningKey
 import os
+import sys
 import colorama
 from colorama import Fore, Style
 import traceback
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 
+# Optional: orjson parses/serializes JSON several times faster; falls back to the stdlib if missing.
+# _json_dumps always returns compact str output.
+try:
+	import orjson
+	_json_loads = orjson.loads
+
+	def _json_dumps(obj: Any) -> str:
+		try:
+			return orjson.dumps(obj).decode("utf-8")
+		except TypeError:
+			# types orjson refuses (non-str keys, huge ints): let the stdlib handle them
+			return json.dumps(obj, separators=(",", ":"))
+except Exception:
+	_json_loads = json.loads
+
+	def _json_dumps(obj: Any) -> str:
+		return json.dumps(obj, separators=(",", ":"))
+
 # -----------------------------
 # GUI HUB OUTPUTS
 # -----------------------------
@@ -68,10 +94,10 @@ def _load_gui_settings() -> dict:
 	Caches by mtime so it is cheap to call frequently.
 	"""
 	try:
-		if not os.path.isfile(_GUI_SETTINGS_PATH):
+		try:
+			mtime = os.stat(_GUI_SETTINGS_PATH).st_mtime
+		except OSError:
 			return dict(_gui_settings_cache)
-
-		mtime = os.path.getmtime(_GUI_SETTINGS_PATH)
 		if _gui_settings_cache["mtime"] == mtime:
 			return dict(_gui_settings_cache)
 
@@ -223,8 +249,104 @@ def _build_base_paths(main_dir_in: str, coins_in: list) -> dict:
 	return out
 
 
+def _safe_float(x: Any, default: float = 0.0) -> float:
+	"""
+	Same result as float(x or default), without the extra conversion when x is already a float
+	(the common case for JSON-parsed numbers and our own caches).
+	"""
+	if type(x) is float:
+		return x
+	return float(x) if x else default
+
+
+@lru_cache(maxsize=256)
+def _norm_symbol(symbol: str) -> str:
+	"""
+	Uppercased/stripped coin symbol ("btc " -> "BTC").
+	Cached because the per-tick helpers normalize the same handful of symbols over and over.
+	"""
+	return str(symbol).upper().strip()
+
+
+def _iter_lines_reversed(path: str, chunk_size: int = 64 * 1024):
+	"""
+	Yields the raw (bytes) lines of a file from the LAST line to the first,
+	reading it backwards in fixed-size chunks (like `tail`) so callers that only
+	care about recent JSONL entries never touch the rest of the file.
+	"""
+	with open(path, "rb") as f:
+		f.seek(0, os.SEEK_END)
+		pos = f.tell()
+		tail = b""
+		while pos > 0:
+			step = min(chunk_size, pos)
+			pos -= step
+			f.seek(pos)
+			lines = (f.read(step) + tail).split(b"\n")
+			tail = lines[0]  # may be the end of a line that continues in the previous chunk
+			for line in reversed(lines[1:]):
+				yield line
+		yield tail
+
+
+# --- Neural output files (written by the thinker) ---
+# Cached by (mtime, size) so each tick only stat()s them; they are re-read when the thinker rewrites them.
+_neural_file_cache = {}  # path -> ((mtime_ns, size), value)
+
+
+def _read_file_cached(path: str, loader, default):
+	try:
+		st = os.stat(path)
+	except OSError:
+		return default
+	sig = (st.st_mtime_ns, st.st_size)
+	hit = _neural_file_cache.get(path)
+	if hit is not None and hit[0] == sig:
+		return hit[1]
+	value = loader(path)
+	_neural_file_cache[path] = (sig, value)
+	return value
+
+
+def _load_signal_file(path: str) -> int:
+	try:
+		with open(path, "r") as f:
+			raw = f.read().strip()
+		return int(float(raw))
+	except Exception:
+		return 0
+
+
+def _load_price_levels_file(path: str) -> list:
+	"""Parses a neural price-levels file (low_bound_prices.html) into floats, highest->lowest."""
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			raw = (f.read() or "").strip()
+		if not raw:
+			return []
+
+		# Normalize common formats: python-list, comma-separated, newline-separated
+		raw = raw.strip().strip("[]()")
+		raw = raw.replace(",", " ").replace(";", " ").replace("|", " ")
+		raw = raw.replace("\n", " ").replace("\t", " ")
+		parts = [p for p in raw.split() if p]
+
+		vals = []
+		for p in parts:
+			try:
+				vals.append(float(p))
+			except Exception:
+				continue
+
+		# De-dupe (first occurrence wins, keyed on 12 decimals), then sort high->low for stable N1..N7 mapping
+		uniq = {round(v, 12): v for v in reversed(vals)}
+		return sorted(uniq.values(), reverse=True)
+	except Exception:
+		return []
+
+
 # Live globals (will be refreshed inside manage_trades())
-crypto_symbols = ['BTC', 'ETH', 'XRP', 'BNB', 'DOGE']
+crypto_symbols = ['BTC', 'ETH', 'XRP', 'BNB', 'DOGE']  # always stripped + uppercase
 
 # Default main_dir behavior if settings are missing
 main_dir = os.getcwd()
@@ -342,6 +464,12 @@ if not API_KEY or not BASE64_PRIVATE_KEY:
     )
     raise SystemExit(1)
 
+# Robinhood order rejections look like "... has too much precision ... nearest 0.00001 ..."
+_PRECISION_RE = re.compile(r"nearest (\d+)(?:\.(\d+))?")
+
+# C-level sort key for order history (avoids a Python lambda call per comparison key)
+_GET_CREATED_AT = itemgetter("created_at")
+
 class CryptoAPITrading:
     def __init__(self):
         # keep a copy of the folder map (same idea as trader.py)
@@ -352,9 +480,39 @@ class CryptoAPITrading:
         self.private_key = SigningKey(private_key_seed)
         self.base_url = "https://trading.robinhood.com"
 
-        self.dca_levels_triggered = {}  # Track DCA levels for each crypto
+        # One keep-alive session for every API call (avoids a new TCP/TLS handshake per request)
+        # Failures to connect are retried a couple of times for every method, order POSTs included
+        # (the request never went out, so it can't be sent twice); read errors and HTTP error
+        # statuses are never retried here.
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1),
+        ))
+
+        # Small shared pool for overlapping independent (network-bound) API calls
+        self._io_pool = ThreadPoolExecutor(max_workers=8)
+
+        # Holdings are requested several times per tick (manage_trades, cost basis, DCA init);
+        # reuse a good response briefly and drop it whenever an order goes through.
+        self._holdings_cache = (None, 0.0)  # (response, monotonic expiry)
+        self.holdings_cache_ttl_seconds = 1.0
+
+        self._trading_pairs_cache = (None, 0.0)  # (results list, monotonic expiry)
+        self.trading_pairs_cache_ttl_seconds = 3600.0
+
+        # Quantity decimals Robinhood demanded via a "too much precision" error, per symbol,
+        # so later buys start at the right precision instead of failing once first.
+        self._order_qty_decimals = {}  # { "DOGE-USD": 2 }
+
+        self.dca_levels_triggered = {}  # { "BTC": number of DCA stages completed in the current trade }
+        self._last_fills_sig = {}  # { "BTC": (filled order count, newest created_at) } seen by initialize_dca_levels
         self.dca_levels = list(DCA_LEVELS)  # Hard DCA triggers (percent PnL)
 
+        # GUI settings hot-reload is checked at most this often (first tick always checks)
+        self._last_settings_refresh = None  # monotonic; None -> reload on the first tick
+        self.settings_refresh_seconds = 10.0
 
         # --- Trailing profit margin (per-coin state) ---
         # Each coin keeps its own trailing PM line, peak, and "was above line" flag.
@@ -372,6 +530,7 @@ class CryptoAPITrading:
 
 
 
+        self._cost_basis_qty = {}  # { "BTC": held quantity the current cost_basis entry was computed for }
         self.cost_basis = self.calculate_cost_basis()  # Initialize cost basis at startup
         self.initialize_dca_levels()  # Initialize DCA levels based on historical buy orders
 
@@ -379,10 +538,18 @@ class CryptoAPITrading:
         self._pnl_ledger = self._load_pnl_ledger()
         self._reconcile_pending_orders()
 
+        # trader_status.json is only rewritten when its content changes (or the heartbeat is due)
+        self._last_status_body = None
+        self._last_status_write_ts = 0.0
+        self.status_heartbeat_seconds = 10.0
+
 
         # Cache last known bid/ask per symbol so transient API misses don't zero out account value
         self._last_good_bid_ask = {}
 
+        # Last text written to each <SYM>_current_price.txt (unchanged prices aren't rewritten)
+        self._last_price_file_text = {}
+
         # Cache last *complete* account snapshot so transient holdings/price misses can't write a bogus low value
         self._last_good_account_snapshot = {
             "total_account_value": None,
@@ -396,7 +563,7 @@ class CryptoAPITrading:
         self.max_dca_buys_per_24h = int(MAX_DCA_BUYS_PER_24H)
         self.dca_window_seconds = 24 * 60 * 60
 
-        self._dca_buy_ts = {}         # { "BTC": [ts, ts, ...] } (DCA buys only)
+        self._dca_buy_ts = {}         # { "BTC": deque([ts, ts, ...]) } (DCA buys only, oldest first)
         self._dca_last_sell_ts = {}   # { "BTC": ts_of_last_sell }
         self._seed_dca_window_from_history()
 
@@ -408,10 +575,12 @@ class CryptoAPITrading:
 
 
     def _atomic_write_json(self, path: str, data: dict) -> None:
+        # Compact output: these files are rewritten constantly and only read by the hub.
         try:
+            payload = _json_dumps(data)
             tmp = f"{path}.tmp"
             with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+                f.write(payload)
             os.replace(tmp, path)
         except Exception:
             pass
@@ -419,7 +588,7 @@ class CryptoAPITrading:
     def _append_jsonl(self, path: str, obj: dict) -> None:
         try:
             with open(path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(obj) + "\n")
+                f.write(_json_dumps(obj) + "\n")
         except Exception:
             pass
 
@@ -464,7 +633,7 @@ class CryptoAPITrading:
                     if not line:
                         continue
                     try:
-                        obj = json.loads(line)
+                        obj = _json_loads(line)
                     except Exception:
                         continue
                     if str(obj.get("order_id", "")).strip() == str(order_id).strip():
@@ -504,8 +673,8 @@ class CryptoAPITrading:
             total_notional = 0.0
             for ex in execs:
                 try:
-                    q = float(ex.get("quantity", 0.0) or 0.0)
-                    p = float(ex.get("effective_price", 0.0) or 0.0)
+                    q = _safe_float(ex.get("quantity"))
+                    p = _safe_float(ex.get("effective_price"))
                     if q > 0.0 and p > 0.0:
                         total_qty += q
                         total_notional += (q * p)
@@ -544,15 +713,16 @@ class CryptoAPITrading:
     def _wait_for_order_terminal(self, symbol: str, order_id: str) -> Optional[dict]:
         """Blocks until order is filled/canceled/rejected, then returns the order dict."""
         terminal = {"filled", "canceled", "cancelled", "rejected", "failed", "error"}
+        # Market orders usually fill almost immediately: poll fast first, then back off to 1s.
+        delay = 0.2
         while True:
             o = self._get_order_by_id(symbol, order_id)
-            if not o:
-                time.sleep(1)
-                continue
-            st = str(o.get("state", "")).lower().strip()
-            if st in terminal:
-                return o
-            time.sleep(1)
+            if o:
+                st = str(o.get("state", "")).lower().strip()
+                if st in terminal:
+                    return o
+            time.sleep(delay)
+            delay = min(1.0, delay * 2.0)
 
     def _reconcile_pending_orders(self) -> None:
         """
@@ -776,12 +946,42 @@ class CryptoAPITrading:
 
 
 
+    def _write_current_price_files(self, prices: dict) -> None:
+        """
+        Writes <SYM>_current_price.txt for each coin in one batch after the tick's loops,
+        skipping coins whose price text is the same as the last one we wrote.
+        """
+        for sym, price in prices.items():
+            text = str(price)
+            if self._last_price_file_text.get(sym) == text:
+                continue
+            try:
+                with open(sym + '_current_price.txt', 'w+') as f:
+                    f.write(text)
+                self._last_price_file_text[sym] = text
+            except Exception:
+                pass
+
     def _write_trader_status(self, status: dict) -> None:
+        # Skip the rewrite when nothing but the timestamp changed (the hub redraws on mtime),
+        # but still refresh every few seconds so the hub's "Last status" keeps ticking.
+        try:
+            body = {k: v for k, v in status.items() if k != "timestamp"}
+            now = float(status.get("timestamp", time.time()))
+            if (body == self._last_status_body) and ((now - self._last_status_write_ts) < self.status_heartbeat_seconds):
+                return
+        except Exception:
+            body = None
+            now = time.time()
+
         self._atomic_write_json(TRADER_STATUS_PATH, status)
+        self._last_status_body = body
+        self._last_status_write_ts = now
 
     @staticmethod
     def _get_current_timestamp() -> int:
-        return int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp())
+        # Unix seconds (same value as datetime.now(utc).timestamp(), without building a datetime)
+        return int(time.time())
 
     @staticmethod
     def _fmt_price(price: float) -> str:
@@ -830,16 +1030,10 @@ class CryptoAPITrading:
         - Start gate: start trades at level 3+
         - DCA assist: levels 4-7 map to trader DCA stages 0-3 (trade starts at level 3 => stage 0)
         """
-        sym = str(symbol).upper().strip()
+        sym = _norm_symbol(symbol)
         folder = base_paths.get(sym, main_dir if sym == "BTC" else os.path.join(main_dir, sym))
         path = os.path.join(folder, "long_dca_signal.txt")
-        try:
-            with open(path, "r") as f:
-                raw = f.read().strip()
-            val = int(float(raw))
-            return val
-        except Exception:
-            return 0
+        return _read_file_cached(path, _load_signal_file, 0)
 
 
     @staticmethod
@@ -851,16 +1045,10 @@ class CryptoAPITrading:
         - Start gate: start trades at level 3+
         - DCA assist: levels 4-7 map to trader DCA stages 0-3 (trade starts at level 3 => stage 0)
         """
-        sym = str(symbol).upper().strip()
+        sym = _norm_symbol(symbol)
         folder = base_paths.get(sym, main_dir if sym == "BTC" else os.path.join(main_dir, sym))
         path = os.path.join(folder, "short_dca_signal.txt")
-        try:
-            with open(path, "r") as f:
-                raw = f.read().strip()
-            val = int(float(raw))
-            return val
-        except Exception:
-            return 0
+        return _read_file_cached(path, _load_signal_file, 0)
 
     @staticmethod
     def _read_long_price_levels(symbol: str) -> list:
@@ -872,41 +1060,10 @@ class CryptoAPITrading:
           ...
           N7 = 7th blue line (bottom)
         """
-        sym = str(symbol).upper().strip()
+        sym = _norm_symbol(symbol)
         folder = base_paths.get(sym, main_dir if sym == "BTC" else os.path.join(main_dir, sym))
         path = os.path.join(folder, "low_bound_prices.html")
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw = (f.read() or "").strip()
-            if not raw:
-                return []
-
-            # Normalize common formats: python-list, comma-separated, newline-separated
-            raw = raw.strip().strip("[]()")
-            raw = raw.replace(",", " ").replace(";", " ").replace("|", " ")
-            raw = raw.replace("\n", " ").replace("\t", " ")
-            parts = [p for p in raw.split() if p]
-
-            vals = []
-            for p in parts:
-                try:
-                    vals.append(float(p))
-                except Exception:
-                    continue
-
-            # De-dupe, then sort high->low for stable N1..N7 mapping
-            out = []
-            seen = set()
-            for v in vals:
-                k = round(float(v), 12)
-                if k in seen:
-                    continue
-                seen.add(k)
-                out.append(float(v))
-            out.sort(reverse=True)
-            return out
-        except Exception:
-            return []
+        return list(_read_file_cached(path, _load_price_levels_file, []))
 
 
 
@@ -922,11 +1079,15 @@ class CryptoAPITrading:
             print("No holdings found. Skipping DCA levels initialization.")
             return
 
+        orders_by_asset = self._get_orders_for_assets(
+            [holding["asset_code"] for holding in holdings.get("results", [])]
+        )
+
         for holding in holdings.get("results", []):
             symbol = holding["asset_code"]
 
             full_symbol = f"{symbol}-USD"
-            orders = self.get_orders(full_symbol)
+            orders = orders_by_asset.get(symbol)
             
             if not orders or "results" not in orders:
                 print(f"No orders found for {full_symbol}. Skipping.")
@@ -935,65 +1096,57 @@ class CryptoAPITrading:
             # Filter for filled buy and sell orders
             filled_orders = [
                 order for order in orders["results"]
-                if order["state"] == "filled" and order["side"] in ["buy", "sell"]
+                if order["state"] == "filled" and order["side"] in ("buy", "sell")
             ]
             
             if not filled_orders:
                 print(f"No filled buy or sell orders for {full_symbol}. Skipping.")
                 continue
 
+            # No new fills since the last refresh -> the stage count can't have changed, skip the sort/scan.
+            # (count + newest timestamp, since the orders endpoint only returns one page of history)
+            fills_sig = (len(filled_orders), max(map(_GET_CREATED_AT, filled_orders)))
+            if (self._last_fills_sig.get(symbol) == fills_sig) and (symbol in self.dca_levels_triggered):
+                continue
+            self._last_fills_sig[symbol] = fills_sig
+
             # Sort orders by creation time in ascending order (oldest first)
-            filled_orders.sort(key=lambda x: x["created_at"])
+            filled_orders.sort(key=_GET_CREATED_AT)
 
-            # Find the timestamp of the most recent sell order
+            # Single right-to-left pass: collect buy times (newest first) until the most recent sell
             most_recent_sell_time = None
+            buy_times = []
             for order in reversed(filled_orders):
                 if order["side"] == "sell":
                     most_recent_sell_time = order["created_at"]
                     break
+                buy_times.append(order["created_at"])
 
             # Determine the cutoff time for buy orders
             if most_recent_sell_time:
-                # Find all buy orders after the most recent sell
-                relevant_buy_orders = [
-                    order for order in filled_orders
-                    if order["side"] == "buy" and order["created_at"] > most_recent_sell_time
-                ]
-                if not relevant_buy_orders:
+                # Only buys strictly after the most recent sell count (drop same-timestamp ties)
+                while buy_times and buy_times[-1] <= most_recent_sell_time:
+                    buy_times.pop()
+                if not buy_times:
                     print(f"No buy orders after the most recent sell for {full_symbol}.")
-                    self.dca_levels_triggered[symbol] = []
+                    self.dca_levels_triggered[symbol] = 0
                     continue
                 print(f"Most recent sell for {full_symbol} at {most_recent_sell_time}.")
             else:
                 # If no sell orders, consider all buy orders
-                relevant_buy_orders = [
-                    order for order in filled_orders
-                    if order["side"] == "buy"
-                ]
-                if not relevant_buy_orders:
+                if not buy_times:
                     print(f"No buy orders for {full_symbol}. Skipping.")
-                    self.dca_levels_triggered[symbol] = []
+                    self.dca_levels_triggered[symbol] = 0
                     continue
                 print(f"No sell orders found for {full_symbol}. Considering all buy orders.")
 
-            # Ensure buy orders are sorted by creation time ascending
-            relevant_buy_orders.sort(key=lambda x: x["created_at"])
-
-            # Identify the first buy order in the relevant list
-            first_buy_order = relevant_buy_orders[0]
-            first_buy_time = first_buy_order["created_at"]
-
-            # Count the number of buy orders after the first buy
-            buy_orders_after_first = [
-                order for order in relevant_buy_orders
-                if order["created_at"] > first_buy_time
-            ]
+            # The first buy of the trade is the oldest one; count the buys after it
+            first_buy_time = buy_times[-1]
+            triggered_levels_count = sum(1 for t in buy_times if t > first_buy_time)
 
-            triggered_levels_count = len(buy_orders_after_first)
-
-            # Track DCA by stage index (0, 1, 2, ...) rather than % values.
+            # Track DCA by stage count (stages 0..count-1 are done) rather than % values.
             # This makes neural-vs-hardcoded clean, and allows repeating the -50% stage indefinitely.
-            self.dca_levels_triggered[symbol] = list(range(triggered_levels_count))
+            self.dca_levels_triggered[symbol] = triggered_levels_count
             print(f"Initialized DCA stages for {symbol}: {triggered_levels_count}")
 
 
@@ -1003,6 +1156,8 @@ class CryptoAPITrading:
         works across restarts.
 
         Uses the local GUI trade history (tag == "DCA") and resets per trade at the most recent sell.
+        The history is read newest-first and stops at the first entry older than the window:
+        a sell before the cutoff can't exclude any buy that is still inside it.
         """
         now_ts = time.time()
         cutoff = now_ts - float(getattr(self, "dca_window_seconds", 86400))
@@ -1014,47 +1169,50 @@ class CryptoAPITrading:
             return
 
         try:
-            with open(TRADE_HISTORY_PATH, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = (line or "").strip()
-                    if not line:
-                        continue
+            for line in _iter_lines_reversed(TRADE_HISTORY_PATH):
+                line = line.strip()
+                if not line:
+                    continue
 
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        continue
+                try:
+                    obj = _json_loads(line)
+                except Exception:
+                    continue
 
-                    ts = obj.get("ts", None)
-                    side = str(obj.get("side", "")).lower()
-                    tag = obj.get("tag", None)
-                    sym_full = str(obj.get("symbol", "")).upper().strip()
-                    base = sym_full.split("-")[0].strip() if sym_full else ""
-                    if not base:
-                        continue
+                ts = obj.get("ts", None)
+                try:
+                    ts_f = ts if type(ts) is float else float(ts)
+                except Exception:
+                    continue
 
-                    try:
-                        ts_f = float(ts)
-                    except Exception:
-                        continue
+                # History is appended in time order, so everything from here back is outside the window
+                if ts_f < cutoff:
+                    break
 
-                    if side == "sell":
-                        prev = float(self._dca_last_sell_ts.get(base, 0.0) or 0.0)
-                        if ts_f > prev:
-                            self._dca_last_sell_ts[base] = ts_f
+                side = str(obj.get("side", "")).lower()
+                tag = obj.get("tag", None)
+                sym_full = _norm_symbol(str(obj.get("symbol", "")))
+                base = sym_full.split("-")[0].strip() if sym_full else ""
+                if not base:
+                    continue
 
-                    elif side == "buy" and tag == "DCA":
-                        self._dca_buy_ts.setdefault(base, []).append(ts_f)
+                if side == "sell":
+                    prev = _safe_float(self._dca_last_sell_ts.get(base))
+                    if ts_f > prev:
+                        self._dca_last_sell_ts[base] = ts_f
+
+                elif side == "buy" and tag == "DCA":
+                    self._dca_buy_ts.setdefault(base, []).append(ts_f)
 
         except Exception:
             return
 
         # Keep only DCA buys after the last sell (current trade) and within rolling 24h
         for base, ts_list in list(self._dca_buy_ts.items()):
-            last_sell = float(self._dca_last_sell_ts.get(base, 0.0) or 0.0)
+            last_sell = _safe_float(self._dca_last_sell_ts.get(base))
             kept = [t for t in ts_list if (t > last_sell) and (t >= cutoff)]
             kept.sort()
-            self._dca_buy_ts[base] = kept
+            self._dca_buy_ts[base] = deque(kept)
 
 
     def _dca_window_count(self, base_symbol: str, now_ts: Optional[float] = None) -> int:
@@ -1062,39 +1220,61 @@ class CryptoAPITrading:
         Count of DCA buys for this coin within rolling 24h in the *current trade*.
         Current trade boundary = most recent sell we observed for this coin.
         """
-        base = str(base_symbol).upper().strip()
+        base = _norm_symbol(base_symbol)
         if not base:
             return 0
 
         now = float(now_ts if now_ts is not None else time.time())
         cutoff = now - float(getattr(self, "dca_window_seconds", 86400))
-        last_sell = float(self._dca_last_sell_ts.get(base, 0.0) or 0.0)
+        last_sell = _safe_float(self._dca_last_sell_ts.get(base))
+
+        dq = self._dca_buy_ts.get(base)
+        if dq is None:
+            return 0
+        self._prune_dca_window(dq, last_sell, cutoff)
+        return len(dq)
+
 
-        ts_list = list(self._dca_buy_ts.get(base, []) or [])
-        ts_list = [t for t in ts_list if (t > last_sell) and (t >= cutoff)]
-        self._dca_buy_ts[base] = ts_list
-        return len(ts_list)
+    @staticmethod
+    def _prune_dca_window(dq: deque, last_sell: float, cutoff: float) -> None:
+        """
+        Drops buys from the left of a time-ordered deque that belong to a previous trade
+        (ts <= last_sell) or have aged out of the rolling window (ts < cutoff).
+        """
+        if not dq:
+            return
+        n = max(bisect.bisect_right(dq, last_sell), bisect.bisect_left(dq, cutoff))
+        for _ in range(n):
+            dq.popleft()
 
 
     def _note_dca_buy(self, base_symbol: str, ts: Optional[float] = None) -> None:
-        base = str(base_symbol).upper().strip()
+        base = _norm_symbol(base_symbol)
         if not base:
             return
         t = float(ts if ts is not None else time.time())
-        self._dca_buy_ts.setdefault(base, []).append(t)
-        self._dca_window_count(base, now_ts=t)  # prune in-place
+        cutoff = t - float(getattr(self, "dca_window_seconds", 86400))
+        last_sell = _safe_float(self._dca_last_sell_ts.get(base))
+
+        # Timestamps are appended in time order, so expired/previous-trade buys are always at the left.
+        dq = self._dca_buy_ts.setdefault(base, deque())
+        self._prune_dca_window(dq, last_sell, cutoff)
+        dq.append(t)
 
 
     def _reset_dca_window_for_trade(self, base_symbol: str, sold: bool = False, ts: Optional[float] = None) -> None:
-        base = str(base_symbol).upper().strip()
+        base = _norm_symbol(base_symbol)
         if not base:
             return
         if sold:
             self._dca_last_sell_ts[base] = float(ts if ts is not None else time.time())
-        self._dca_buy_ts[base] = []
+        self._dca_buy_ts[base] = deque()
 
 
-    def make_api_request(self, method: str, path: str, body: Optional[str] = "") -> Any:
+    def make_api_request(self, method: str, path: str, body: Any = "") -> Any:
+        # Dict bodies are serialized exactly once; the signed string is also the bytes we send.
+        if isinstance(body, dict):
+            body = _json_dumps(body)
 
         timestamp = self._get_current_timestamp()
         headers = self.get_authorization_header(method, path, body, timestamp)
@@ -1102,16 +1282,18 @@ class CryptoAPITrading:
 
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers, timeout=10)
+                response = self._http.get(url, headers=headers, timeout=10)
             elif method == "POST":
-                response = requests.post(url, headers=headers, json=json.loads(body), timeout=10)
+                headers["Content-Type"] = "application/json"
+                response = self._http.post(url, headers=headers, data=body.encode("utf-8"), timeout=10)
 
             response.raise_for_status()
-            return response.json()
+            # Parse the raw body directly (orjson when available) instead of response.json()
+            return _json_loads(response.content)
         except requests.HTTPError as http_err:
             try:
                 # Parse and return the JSON error response
-                error_response = response.json()
+                error_response = _json_loads(response.content)
                 return error_response  # Return the JSON error for further handling
             except Exception:
                 return None
@@ -1135,10 +1317,27 @@ class CryptoAPITrading:
         return self.make_api_request("GET", path)
 
     def get_holdings(self) -> Any:
+        cached, expiry = self._holdings_cache
+        now = time.monotonic()
+        if cached is not None and now < expiry:
+            return cached
+
         path = "/api/v1/crypto/trading/holdings/"
-        return self.make_api_request("GET", path)
+        response = self.make_api_request("GET", path)
+        if isinstance(response, dict) and "results" in response:
+            self._holdings_cache = (response, now + float(self.holdings_cache_ttl_seconds))
+        return response
+
+    def _invalidate_holdings_cache(self) -> None:
+        self._holdings_cache = (None, 0.0)
 
     def get_trading_pairs(self) -> Any:
+        # The pair list (and its increments) effectively never changes; reuse a good response for an hour.
+        # Because of the cache, a non-empty result does NOT mean the API is up (entries gate on holdings_ok).
+        cached, expires = self._trading_pairs_cache
+        if cached and time.monotonic() < expires:
+            return cached
+
         path = "/api/v1/crypto/trading/trading_pairs/"
         response = self.make_api_request("GET", path)
 
@@ -1149,13 +1348,31 @@ class CryptoAPITrading:
         if not trading_pairs:
             return []
 
+        self._trading_pairs_cache = (trading_pairs, time.monotonic() + self.trading_pairs_cache_ttl_seconds)
         return trading_pairs
 
     def get_orders(self, symbol: str) -> Any:
         path = f"/api/v1/crypto/trading/orders/?symbol={symbol}"
         return self.make_api_request("GET", path)
 
-    def calculate_cost_basis(self):
+    def _get_orders_for_assets(self, asset_codes: list) -> Dict[str, Any]:
+        """
+        Fetches order history for several coins at once ({ "BTC": <get_orders response>, ... }).
+        The requests are network-bound, so they are overlapped on a small thread pool
+        instead of paying one round-trip per coin back-to-back.
+        """
+        asset_codes = list(dict.fromkeys(asset_codes))
+        if not asset_codes:
+            return {}
+        results = self._io_pool.map(lambda code: self.get_orders(f"{code}-USD"), asset_codes)
+        return dict(zip(asset_codes, results))
+
+    def calculate_cost_basis(self, changed_assets=None):
+        """
+        With changed_assets (e.g. the coins traded this tick), only those coins -- plus any coin whose
+        held quantity moved since the last calculation -- have their order history re-fetched;
+        every other held coin keeps its previous cost basis. None recomputes everything.
+        """
         holdings = self.get_holdings()
         if not holdings or "results" not in holdings:
             return {}
@@ -1166,10 +1383,21 @@ class CryptoAPITrading:
             for holding in holdings.get("results", [])
         }
 
-        cost_basis = {}
+        prev_basis = getattr(self, "cost_basis", None) or {}
+        if changed_assets is None:
+            to_compute = active_assets
+        else:
+            to_compute = {
+                a for a in active_assets
+                if (a in changed_assets) or (a not in prev_basis) or (self._cost_basis_qty.get(a) != current_quantities[a])
+            }
+
+        cost_basis = {a: prev_basis[a] for a in active_assets - to_compute}
+        orders_by_asset = self._get_orders_for_assets(list(to_compute))
+        self._cost_basis_qty = current_quantities
 
-        for asset_code in active_assets:
-            orders = self.get_orders(f"{asset_code}-USD")
+        for asset_code in to_compute:
+            orders = orders_by_asset.get(asset_code)
             if not orders or "results" not in orders:
                 continue
 
@@ -1178,19 +1406,20 @@ class CryptoAPITrading:
                 order for order in orders["results"]
                 if order["side"] == "buy" and order["state"] == "filled"
             ]
-            buy_orders.sort(key=lambda x: x["created_at"], reverse=True)
+            buy_orders.sort(key=_GET_CREATED_AT, reverse=True)
 
             remaining_quantity = current_quantities[asset_code]
             total_cost = 0.0
 
             for order in buy_orders:
-                for execution in order.get("executions", []):
-                    quantity = float(execution["quantity"])
-                    price = float(execution["effective_price"])
-
+                executions = order.get("executions") or ()
+                for execution in executions:
                     if remaining_quantity <= 0:
                         break
 
+                    quantity = float(execution["quantity"])
+                    price = float(execution["effective_price"])
+
                     # Use only the portion of the quantity needed to match the current holdings
                     if quantity > remaining_quantity:
                         total_cost += remaining_quantity * price
@@ -1209,20 +1438,50 @@ class CryptoAPITrading:
 
         return cost_basis
 
+    def _get_best_bid_ask(self, symbols: list) -> Dict[str, dict]:
+        """
+        Fetches best bid/ask for many symbols in ONE request (?symbol=A&symbol=B...).
+        Returns { "BTC-USD": <result dict>, ... } for the symbols the API answered.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        query = "&".join(f"symbol={s}" for s in symbols)
+        response = self.make_api_request("GET", f"/api/v1/crypto/marketdata/best_bid_ask/?{query}")
+        if not response or "results" not in response:
+            return {}
+
+        out = {}
+        for result in response.get("results") or []:
+            if not isinstance(result, dict):
+                continue
+            sym = result.get("symbol") or (symbols[0] if len(symbols) == 1 else None)
+            if sym:
+                out[sym] = result
+        return out
+
     def get_price(self, symbols: list) -> Dict[str, float]:
         buy_prices = {}
         sell_prices = {}
         valid_symbols = []
 
+        batch = [s for s in symbols if s != "USDC-USD"]
+        quotes = self._get_best_bid_ask(batch)
+
         for symbol in symbols:
             if symbol == "USDC-USD":
                 continue
 
-            path = f"/api/v1/crypto/marketdata/best_bid_ask/?symbol={symbol}"
-            response = self.make_api_request("GET", path)
+            result = quotes.get(symbol)
+            if result is None and len(batch) > 1:
+                # Missing from the batch reply -> retry this one symbol on its own
+                path = f"/api/v1/crypto/marketdata/best_bid_ask/?symbol={symbol}"
+                response = self.make_api_request("GET", path)
+                if response and response.get("results"):
+                    result = response["results"][0]
 
-            if response and "results" in response:
-                result = response["results"][0]
+            if result is not None:
                 ask = float(result["ask_inclusive_of_buy_spread"])
                 bid = float(result["bid_inclusive_of_sell_spread"])
 
@@ -1244,8 +1503,8 @@ class CryptoAPITrading:
                     cached = None
 
                 if cached:
-                    ask = float(cached.get("ask", 0.0) or 0.0)
-                    bid = float(cached.get("bid", 0.0) or 0.0)
+                    ask = _safe_float(cached.get("ask"))
+                    bid = _safe_float(cached.get("bid"))
                     if ask > 0.0 and bid > 0.0:
                         buy_prices[symbol] = ask
                         sell_prices[symbol] = bid
@@ -1264,11 +1523,17 @@ class CryptoAPITrading:
         avg_cost_basis: Optional[float] = None,
         pnl_pct: Optional[float] = None,
         tag: Optional[str] = None,
+        current_price: Optional[float] = None,
     ) -> Any:
-        # Fetch the current price of the asset (for sizing only)
-        current_buy_prices, current_sell_prices, valid_symbols = self.get_price([symbol])
-        current_price = current_buy_prices[symbol]
-        asset_quantity = amount_in_usd / current_price
+        # Current ask of the asset (for sizing only). Callers that already have this tick's
+        # ask pass it in; otherwise fetch it.
+        if not current_price or float(current_price) <= 0.0:
+            current_buy_prices, current_sell_prices, valid_symbols = self.get_price([symbol])
+            current_price = current_buy_prices[symbol]
+        asset_quantity = amount_in_usd / float(current_price)
+        known_decimals = self._order_qty_decimals.get(symbol)
+        if known_decimals is not None:
+            asset_quantity = round(asset_quantity, known_decimals)
 
         max_retries = 5
         retries = 0
@@ -1295,8 +1560,9 @@ class CryptoAPITrading:
                 # --- exact profit tracking snapshot (BEFORE placing order) ---
                 buying_power_before = self._get_buying_power()
 
-                response = self.make_api_request("POST", path, json.dumps(body))
+                response = self.make_api_request("POST", path, body)
                 if response and "errors" not in response:
+                    self._invalidate_holdings_cache()
                     order_id = response.get("id", None)
 
                     # Persist the pre-order buying power so restarts can reconcile precisely
@@ -1366,11 +1632,11 @@ class CryptoAPITrading:
                 for error in response["errors"]:
                     if "has too much precision" in error.get("detail", ""):
                         # Extract required precision directly from the error message
-                        detail = error["detail"]
-                        nearest_value = detail.split("nearest ")[1].split(" ")[0]
-
-                        decimal_places = len(nearest_value.split(".")[1].rstrip("0"))
-                        asset_quantity = round(asset_quantity, decimal_places)
+                        match = _PRECISION_RE.search(error["detail"])
+                        if match:
+                            decimal_places = len((match.group(2) or "").rstrip("0"))
+                            asset_quantity = round(asset_quantity, decimal_places)
+                            self._order_qty_decimals[symbol] = decimal_places
                         break
                     elif "must be greater than or equal to" in error.get("detail", ""):
                         return None
@@ -1406,9 +1672,10 @@ class CryptoAPITrading:
         # --- exact profit tracking snapshot (BEFORE placing order) ---
         buying_power_before = self._get_buying_power()
 
-        response = self.make_api_request("POST", path, json.dumps(body))
+        response = self.make_api_request("POST", path, body)
 
         if response and isinstance(response, dict) and "errors" not in response:
+            self._invalidate_holdings_cache()
             order_id = response.get("id", None)
 
             # Persist the pre-order buying power so restarts can reconcile precisely
@@ -1475,8 +1742,8 @@ class CryptoAPITrading:
 
                     for ex in execs:
                         try:
-                            q = float(ex.get("quantity", 0.0) or 0.0)
-                            p = float(ex.get("effective_price", 0.0) or 0.0)
+                            q = _safe_float(ex.get("quantity"))
+                            p = _safe_float(ex.get("effective_price"))
                             total_qty += q
                             total_notional += (q * p)
 
@@ -1539,69 +1806,162 @@ class CryptoAPITrading:
 
         return response
 
+    @staticmethod
+    def _step_trailing_pm(state, base_pm_line: float, trail_gap: float, sell_price: float, settings_sig: tuple):
+        """
+        Advances one coin's trailing PM state by one tick. Returns (state, crossed_below), where
+        crossed_below means price went from ABOVE the trailing line to BELOW it (forced sell).
+        A missing state, or one created under different trailing settings, starts fresh.
+        """
+        if (state is None) or (state.get("settings_sig") != settings_sig):
+            state = {
+                "active": False,
+                "line": base_pm_line,
+                "peak": 0.0,
+                "was_above": False,
+                "settings_sig": settings_sig,
+            }
+        elif not state.get("active", False):
+            # If trailing hasn't activated yet, this is just the PM line.
+            # It MUST track the current avg_cost_basis (so it can move DOWN after each DCA).
+            state["line"] = base_pm_line
+        elif state.get("line", 0.0) < base_pm_line:
+            # Once trailing is active, the line should never be below the base PM start line.
+            state["line"] = base_pm_line
+
+        # Use SELL price because that's what you actually get when you market sell
+        above_now = sell_price >= state["line"]
+
+        if not state["active"]:
+            if not above_now:
+                state["was_above"] = False
+                return state, False
+            # Activate trailing once we first get above the base PM line
+            state["active"] = True
+            state["peak"] = sell_price
+
+        # Active: update peak and move trailing line up behind it (never below the base PM line)
+        if sell_price > state["peak"]:
+            state["peak"] = sell_price
+        new_line = max(state["peak"] * (1.0 - trail_gap), base_pm_line)
+        if new_line > state["line"]:
+            state["line"] = new_line
 
+        crossed_below = state["was_above"] and (sell_price < state["line"])
+
+        # Save this tick's position relative to the line (needed for "above -> below" detection)
+        state["was_above"] = above_now
+        return state, crossed_below
 
 
 
 
     def manage_trades(self):
         trades_made = False  # Flag to track if any trade was made in this iteration
+        traded_assets = set()  # coins bought/sold this iteration (their cost basis is recomputed)
 
         # Hot-reload coins list + paths + trade params from GUI settings while running
-        try:
-            _refresh_paths_and_symbols()
-            self.path_map = dict(base_paths)
-            self.dca_levels = list(DCA_LEVELS)
-            self.max_dca_buys_per_24h = int(MAX_DCA_BUYS_PER_24H)
+        # (debounced: settings edits are picked up within settings_refresh_seconds)
+        now_mono = time.monotonic()
+        if self._last_settings_refresh is None or (now_mono - self._last_settings_refresh) >= self.settings_refresh_seconds:
+            self._last_settings_refresh = now_mono
+            try:
+                _refresh_paths_and_symbols()
+                self.path_map = dict(base_paths)
+                self.dca_levels = list(DCA_LEVELS)
+                self.max_dca_buys_per_24h = int(MAX_DCA_BUYS_PER_24H)
 
-            # Trailing PM settings (hot-reload)
-            old_sig = getattr(self, "_last_trailing_settings_sig", None)
+                # Trailing PM settings (hot-reload)
+                old_sig = getattr(self, "_last_trailing_settings_sig", None)
 
-            new_gap = float(TRAILING_GAP_PCT)
-            new_pm0 = float(PM_START_PCT_NO_DCA)
-            new_pm1 = float(PM_START_PCT_WITH_DCA)
+                new_gap = float(TRAILING_GAP_PCT)
+                new_pm0 = float(PM_START_PCT_NO_DCA)
+                new_pm1 = float(PM_START_PCT_WITH_DCA)
 
-            self.trailing_gap_pct = new_gap
-            self.pm_start_pct_no_dca = new_pm0
-            self.pm_start_pct_with_dca = new_pm1
+                self.trailing_gap_pct = new_gap
+                self.pm_start_pct_no_dca = new_pm0
+                self.pm_start_pct_with_dca = new_pm1
 
-            new_sig = (float(new_gap), float(new_pm0), float(new_pm1))
+                new_sig = (float(new_gap), float(new_pm0), float(new_pm1))
 
-            # If trailing settings changed, reset ALL trailing PM state so:
-            # - the line updates immediately
-            # - peak/armed/was_above are cleared
-            if (old_sig is not None) and (new_sig != old_sig):
-                self.trailing_pm = {}
+                # If trailing settings changed, reset ALL trailing PM state so:
+                # - the line updates immediately
+                # - peak/armed/was_above are cleared
+                if (old_sig is not None) and (new_sig != old_sig):
+                    self.trailing_pm = {}
 
-            self._last_trailing_settings_sig = new_sig
-        except Exception:
-            pass
+                self._last_trailing_settings_sig = new_sig
+            except Exception:
+                pass
 
+        # Trade-start level is tick-invariant (only changes on settings hot-reload above):
+        # resolve it once instead of per held coin and per start candidate.
+        start_level = max(1, min(int(TRADE_START_LEVEL or 3), 7))
+        # Neural DCA applies to the levels BELOW the trade-start level.
+        # Example: trade_start_level=3 => stages 0..3 map to N4..N7 (4 total).
+        neural_dca_max = max(0, 7 - start_level)
 
 
+        # Fetch account details, holdings and trading pairs (independent requests -> overlapped)
+        account_f = self._io_pool.submit(self.get_account)
+        holdings_f = self._io_pool.submit(self.get_holdings)
+        trading_pairs_f = self._io_pool.submit(self.get_trading_pairs)
+        account = account_f.result()
+        holdings = holdings_f.result()
+        trading_pairs = trading_pairs_f.result()
 
-        # Fetch account details
-        account = self.get_account()
-        # Fetch holdings
-        holdings = self.get_holdings()
-        # Fetch trading pairs
-        trading_pairs = self.get_trading_pairs()
+        # Calculate total account value (robust: never drop a held coin to $0 on transient API misses)
+        snapshot_ok = True
+
+        # holdings list (treat missing/invalid holdings payload as transient error)
+        # Validated once here; the price-symbol list, value sum and positions loop all reuse it.
+        # holdings_ok=False means "holdings unknown" (not "nothing held"): no new trades are started.
+        holdings_ok = True
+        try:
+            holdings_list = holdings.get("results", None) if isinstance(holdings, dict) else None
+            if not isinstance(holdings_list, list):
+                holdings_list = []
+                holdings_ok = False
+                snapshot_ok = False
+        except Exception:
+            holdings_list = []
+            holdings_ok = False
+            snapshot_ok = False
+
+        # Holdings can lag the order endpoint right after a fill. If any held quantity no longer matches
+        # what the stored cost basis was computed for, recompute those coins (only they refetch orders).
+        if snapshot_ok:
+            try:
+                held_qty = {h["asset_code"]: float(h["total_quantity"]) for h in holdings_list}
+            except Exception:
+                held_qty = None
+            if (held_qty is not None) and (held_qty != self._cost_basis_qty):
+                new_cost_basis = self.calculate_cost_basis(set())
+                if new_cost_basis:
+                    self.cost_basis = new_cost_basis
 
         # Use the stored cost_basis instead of recalculating
         cost_basis = self.cost_basis
+
         # Fetch current prices
-        symbols = [holding["asset_code"] + "-USD" for holding in holdings.get("results", [])]
+        symbols = [holding["asset_code"] + "-USD" for holding in holdings_list]
 
         # ALSO fetch prices for tracked coins even if not currently held (so GUI can show bid/ask lines)
+        seen_symbols = set(symbols)
         for s in crypto_symbols:
             full = f"{s}-USD"
-            if full not in symbols:
+            if full not in seen_symbols:
+                seen_symbols.add(full)
                 symbols.append(full)
 
         current_buy_prices, current_sell_prices, valid_symbols = self.get_price(symbols)
 
-        # Calculate total account value (robust: never drop a held coin to $0 on transient API misses)
-        snapshot_ok = True
+        # Per-tick quote table keyed by BASE symbol: { "BTC": (ask, bid) } for every symbol with a usable price.
+        # Built once so the loops below do one dict hit instead of "-USD" string building,
+        # a linear valid_symbols scan and two separate price lookups per coin.
+        quotes = {}
+        for full in valid_symbols:
+            quotes[full.rsplit("-", 1)[0]] = (current_buy_prices[full], current_sell_prices[full])
 
         # buying power
         try:
@@ -1610,16 +1970,6 @@ class CryptoAPITrading:
             buying_power = 0.0
             snapshot_ok = False
 
-        # holdings list (treat missing/invalid holdings payload as transient error)
-        try:
-            holdings_list = holdings.get("results", None) if isinstance(holdings, dict) else None
-            if not isinstance(holdings_list, list):
-                holdings_list = []
-                snapshot_ok = False
-        except Exception:
-            holdings_list = []
-            snapshot_ok = False
-
         holdings_buy_value = 0.0
         holdings_sell_value = 0.0
 
@@ -1633,9 +1983,7 @@ class CryptoAPITrading:
                 if qty <= 0.0:
                     continue
 
-                sym = f"{asset}-USD"
-                bp = float(current_buy_prices.get(sym, 0.0) or 0.0)
-                sp = float(current_sell_prices.get(sym, 0.0) or 0.0)
+                bp, sp = quotes.get(asset, (0.0, 0.0))
 
                 # If any held asset is missing a usable price this tick, do NOT allow a new "low" snapshot
                 if bp <= 0.0 or sp <= 0.0:
@@ -1670,28 +2018,47 @@ class CryptoAPITrading:
                 "percent_in_trade": float(in_use),
             }
 
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("\n--- Account Summary ---")
-        print(f"Total Account Value: ${total_account_value:.2f}")
-        print(f"Holdings Value: ${holdings_sell_value:.2f}")
-        print(f"Percent In Trade: {in_use:.2f}%")
-        print(
+        # Summary header is built up and written in one go (one write instead of a print per line).
+        out = []
+        # Clear the console with ANSI codes (colorama translates them on Windows) instead of
+        # spawning a shell every tick. Skipped when stdout is a pipe (the hub log reader).
+        if sys.stdout.isatty():
+            out.append("\033[2J\033[H")
+        out.append("\n--- Account Summary ---\n")
+        out.append(f"Total Account Value: ${total_account_value:.2f}\n")
+        out.append(f"Holdings Value: ${holdings_sell_value:.2f}\n")
+        out.append(f"Percent In Trade: {in_use:.2f}%\n")
+        out.append(
             f"Trailing PM: start +{self.pm_start_pct_no_dca:.2f}% (no DCA) / +{self.pm_start_pct_with_dca:.2f}% (with DCA) "
-            f"| gap {self.trailing_gap_pct:.2f}%"
+            f"| gap {self.trailing_gap_pct:.2f}%\n"
+        )
+        out.append("\n--- Current Trades ---\n")
+        sys.stdout.write("".join(out))
+
+        # Loop-invariant settings for the holdings loop (display + trigger paths share these)
+        dca_levels = self.dca_levels
+        dca_levels_len = len(dca_levels)
+        pm_no_dca = self.pm_start_pct_no_dca
+        pm_with_dca = self.pm_start_pct_with_dca
+        trail_gap = self.trailing_gap_pct / 100.0  # 0.5% => 0.005
+        trailing_settings_sig = (
+            float(self.trailing_gap_pct),
+            float(pm_no_dca),
+            float(pm_with_dca),
         )
-        print("\n--- Current Trades ---")
 
         positions = {}
-        for holding in holdings.get("results", []):
+        price_files = {}  # { "BTC": current_buy_price } flushed to <SYM>_current_price.txt after the loops
+        for holding in holdings_list:
             symbol = holding["asset_code"]
             full_symbol = f"{symbol}-USD"
 
-            if full_symbol not in valid_symbols or symbol == "USDC":
+            quote = quotes.get(symbol)
+            if quote is None or symbol == "USDC":
                 continue
 
             quantity = float(holding["total_quantity"])
-            current_buy_price = current_buy_prices.get(full_symbol, 0)
-            current_sell_price = current_sell_prices.get(full_symbol, 0)
+            current_buy_price, current_sell_price = quote
             avg_cost_basis = cost_basis.get(symbol, 0)
 
             if avg_cost_basis > 0:
@@ -1703,19 +2070,14 @@ class CryptoAPITrading:
                 print(f"  Warning: Average Cost Basis is 0 for {symbol}, Gain/Loss calculation skipped.")
 
             value = quantity * current_sell_price
-            triggered_levels_count = len(self.dca_levels_triggered.get(symbol, []))
+            triggered_levels_count = int(self.dca_levels_triggered.get(symbol, 0))
             triggered_levels = triggered_levels_count  # Number of DCA levels triggered
 
             # Determine the next DCA trigger for this coin (hardcoded % and optional neural level)
             next_stage = triggered_levels_count  # stage 0 == first DCA after entry (trade starts at neural level 3)
 
             # Hardcoded % for this stage (repeat -50% after we reach it)
-            hard_next = self.dca_levels[next_stage] if next_stage < len(self.dca_levels) else self.dca_levels[-1]
-
-            # Neural DCA applies to the levels BELOW the trade-start level.
-            # Example: trade_start_level=3 => stages 0..3 map to N4..N7 (4 total).
-            start_level = max(1, min(int(TRADE_START_LEVEL or 3), 7))
-            neural_dca_max = max(0, 7 - start_level)
+            hard_next = dca_levels[next_stage] if next_stage < dca_levels_len else dca_levels[-1]
 
             if next_stage < neural_dca_max:
                 neural_next = start_level + 1 + next_stage
@@ -1784,7 +2146,7 @@ class CryptoAPITrading:
             dist_to_trail_pct = 0.0
 
             if avg_cost_basis > 0:
-                pm_start_pct_disp = self.pm_start_pct_no_dca if int(triggered_levels) == 0 else self.pm_start_pct_with_dca
+                pm_start_pct_disp = pm_no_dca if triggered_levels == 0 else pm_with_dca
                 base_pm_line_disp = avg_cost_basis * (1.0 + (pm_start_pct_disp / 100.0))
 
                 state = self.trailing_pm.get(symbol)
@@ -1803,9 +2165,7 @@ class CryptoAPITrading:
 
                 if trail_line_disp > 0:
                     dist_to_trail_pct = ((current_sell_price - trail_line_disp) / trail_line_disp) * 100.0
-            file = open(symbol+'_current_price.txt', 'w+')
-            file.write(str(current_buy_price))
-            file.close()
+            price_files[symbol] = current_buy_price
             positions[symbol] = {
                 "quantity": quantity,
                 "avg_cost_basis": avg_cost_basis,
@@ -1826,120 +2186,71 @@ class CryptoAPITrading:
             }
 
 
+            if avg_cost_basis > 0:
+                trail_line_text = (
+                    f"  Trailing Profit Margin"
+                    f"  |  Line: {self._fmt_price(trail_line_disp)}"
+                    f"  |  Above: {above_disp}"
+                )
+            else:
+                trail_line_text = "  PM/Trail: N/A (avg_cost_basis is 0)"
+
+            # Both display lines for this coin in a single print
             print(
                 f"\nSymbol: {symbol}"
                 f"  |  DCA: {color}{dca_line_pct:+.2f}%{Style.RESET_ALL} @ {self._fmt_price(current_buy_price)} (Line: {dca_line_price_disp} {dca_line_source} | Next: {next_dca_display})"
                 f"  |  Gain/Loss SELL: {color2}{gain_loss_percentage_sell:.2f}%{Style.RESET_ALL} @ {self._fmt_price(current_sell_price)}"
                 f"  |  DCA Levels Triggered: {triggered_levels}"
                 f"  |  Trade Value: ${value:.2f}"
+                f"\n{trail_line_text}"
             )
 
 
 
-
-            if avg_cost_basis > 0:
-                print(
-                    f"  Trailing Profit Margin"
-                    f"  |  Line: {self._fmt_price(trail_line_disp)}"
-                    f"  |  Above: {above_disp}"
-                )
-            else:
-                print("  PM/Trail: N/A (avg_cost_basis is 0)")
-
-
-
             # --- Trailing profit margin (0.5% trail gap) ---
             # PM "start line" is the normal 5% / 2.5% line (depending on DCA levels hit).
             # Trailing activates once price is ABOVE the PM start line, then line follows peaks up
             # by 0.5%. Forced sell happens ONLY when price goes from ABOVE the trailing line to BELOW it.
             if avg_cost_basis > 0:
-                pm_start_pct = self.pm_start_pct_no_dca if int(triggered_levels) == 0 else self.pm_start_pct_with_dca
-                base_pm_line = avg_cost_basis * (1.0 + (pm_start_pct / 100.0))
-                trail_gap = self.trailing_gap_pct / 100.0  # 0.5% => 0.005
-
-                # If trailing settings changed since this coin's state was created, reset it.
-                settings_sig = (
-                    float(self.trailing_gap_pct),
-                    float(self.pm_start_pct_no_dca),
-                    float(self.pm_start_pct_with_dca),
+                # Same PM start line as the display block above
+                state, crossed_below = self._step_trailing_pm(
+                    self.trailing_pm.get(symbol),
+                    base_pm_line_disp,
+                    trail_gap,
+                    current_sell_price,
+                    trailing_settings_sig,
                 )
+                self.trailing_pm[symbol] = state
 
-                state = self.trailing_pm.get(symbol)
-                if (state is None) or (state.get("settings_sig") != settings_sig):
-                    state = {
-                        "active": False,
-                        "line": base_pm_line,
-                        "peak": 0.0,
-                        "was_above": False,
-                        "settings_sig": settings_sig,
-                    }
-                    self.trailing_pm[symbol] = state
-                else:
-                    # Keep signature up to date
-                    state["settings_sig"] = settings_sig
-
-                    # IMPORTANT:
-                    # If trailing hasn't activated yet, this is just the PM line.
-                    # It MUST track the current avg_cost_basis (so it can move DOWN after each DCA).
-                    if not state.get("active", False):
-                        state["line"] = base_pm_line
-                    else:
-                        # Once trailing is active, the line should never be below the base PM start line.
-                        if state.get("line", 0.0) < base_pm_line:
-                            state["line"] = base_pm_line
-
-                # Use SELL price because that's what you actually get when you market sell
-                above_now = current_sell_price >= state["line"]
-
-                # Activate trailing once we first get above the base PM line
-                if (not state["active"]) and above_now:
-                    state["active"] = True
-                    state["peak"] = current_sell_price
-
-                # If active, update peak and move trailing line up behind it
-                if state["active"]:
-                    if current_sell_price > state["peak"]:
-                        state["peak"] = current_sell_price
-
-                    new_line = state["peak"] * (1.0 - trail_gap)
-                    if new_line < base_pm_line:
-                        new_line = base_pm_line
-                    if new_line > state["line"]:
-                        state["line"] = new_line
-
-                    # Forced sell on cross from ABOVE -> BELOW trailing line
-                    if state["was_above"] and (current_sell_price < state["line"]):
-                        print(
-                            f"  Trailing PM hit for {symbol}. "
-                            f"Sell price {current_sell_price:.8f} fell below trailing line {state['line']:.8f}."
-                        )
-                        response = self.place_sell_order(
-                            str(uuid.uuid4()),
-                            "sell",
-                            "market",
-                            full_symbol,
-                            quantity,
-                            expected_price=current_sell_price,
-                            avg_cost_basis=avg_cost_basis,
-                            pnl_pct=gain_loss_percentage_sell,
-                            tag="TRAIL_SELL",
-                        )
-
-                        if response and isinstance(response, dict) and "errors" not in response:
-                            trades_made = True
-                            self.trailing_pm.pop(symbol, None)  # clear per-coin trailing state on exit
-
-                            # Trade ended -> reset rolling 24h DCA window for this coin
-                            self._reset_dca_window_for_trade(symbol, sold=True)
+                # Forced sell on cross from ABOVE -> BELOW trailing line
+                if crossed_below:
+                    print(
+                        f"  Trailing PM hit for {symbol}. "
+                        f"Sell price {current_sell_price:.8f} fell below trailing line {state['line']:.8f}."
+                    )
+                    response = self.place_sell_order(
+                        str(uuid.uuid4()),
+                        "sell",
+                        "market",
+                        full_symbol,
+                        quantity,
+                        expected_price=current_sell_price,
+                        avg_cost_basis=avg_cost_basis,
+                        pnl_pct=gain_loss_percentage_sell,
+                        tag="TRAIL_SELL",
+                    )
 
-                            print(f"  Successfully sold {quantity} {symbol}.")
-                            time.sleep(5)
-                            holdings = self.get_holdings()
-                            continue
+                    if response and isinstance(response, dict) and "errors" not in response:
+                        trades_made = True
+                        traded_assets.add(symbol)
+                        self.trailing_pm.pop(symbol, None)  # clear per-coin trailing state on exit
 
+                        # Trade ended -> reset rolling 24h DCA window for this coin
+                        self._reset_dca_window_for_trade(symbol, sold=True)
 
-                # Save this tick’s position relative to the line (needed for “above -> below” detection)
-                state["was_above"] = above_now
+                        print(f"  Successfully sold {quantity} {symbol}.")
+                        holdings = self.get_holdings()
+                        continue
 
 
 
@@ -1951,10 +2262,10 @@ class CryptoAPITrading:
             #   stage 2 => neural 6 OR -10.0%
             #   stage 3 => neural 7 OR -20.0%
             # After that: hardcoded only (-30, -40, -50, then repeat -50 forever).
-            current_stage = len(self.dca_levels_triggered.get(symbol, []))
+            current_stage = triggered_levels_count
 
-            # Hardcoded loss % for this stage (repeat last level after list ends)
-            hard_level = self.dca_levels[current_stage] if current_stage < len(self.dca_levels) else self.dca_levels[-1]
+            # Hardcoded loss % for this stage (repeat last level after list ends) -- same stage as hard_next
+            hard_level = hard_next
             hard_hit = gain_loss_percentage_buy <= hard_level
 
             # Neural trigger only for first 4 DCA stages
@@ -2001,12 +2312,13 @@ class CryptoAPITrading:
                         avg_cost_basis=avg_cost_basis,
                         pnl_pct=gain_loss_percentage_buy,
                         tag="DCA",
+                        current_price=current_buy_price,
                     )
 
                     print(f"  Buy Response: {response}")
                     if response and "errors" not in response:
                         # record that we completed THIS stage (no matter what triggered it)
-                        self.dca_levels_triggered.setdefault(symbol, []).append(current_stage)
+                        self.dca_levels_triggered[symbol] = current_stage + 1
 
                         # Only record a DCA buy timestamp on success (so skips never advance anything)
                         self._note_dca_buy(symbol)
@@ -2016,6 +2328,7 @@ class CryptoAPITrading:
                         self.trailing_pm.pop(symbol, None)
 
                         trades_made = True
+                        traded_assets.add(symbol)
                         print(f"  Successfully placed DCA buy order for {symbol}.")
                     else:
                         print(f"  Failed to place DCA buy order for {symbol}.")
@@ -2033,20 +2346,14 @@ class CryptoAPITrading:
                 if sym in positions:
                     continue
 
-                full_symbol = f"{sym}-USD"
-                if full_symbol not in valid_symbols or sym == "USDC":
+                quote = quotes.get(sym)
+                if quote is None or sym == "USDC":
                     continue
 
-                current_buy_price = current_buy_prices.get(full_symbol, 0.0)
-                current_sell_price = current_sell_prices.get(full_symbol, 0.0)
+                current_buy_price, current_sell_price = quote
 
                 # keep the per-coin current price file behavior for consistency
-                try:
-                    file = open(sym + '_current_price.txt', 'w+')
-                    file.write(str(current_buy_price))
-                    file.close()
-                except Exception:
-                    pass
+                price_files[sym] = current_buy_price
 
                 positions[sym] = {
                     "quantity": 0.0,
@@ -2056,7 +2363,7 @@ class CryptoAPITrading:
                     "gain_loss_pct_buy": 0.0,
                     "gain_loss_pct_sell": 0.0,
                     "value_usd": 0.0,
-                    "dca_triggered_stages": int(len(self.dca_levels_triggered.get(sym, []))),
+                    "dca_triggered_stages": int(self.dca_levels_triggered.get(sym, 0)),
                     "next_dca_display": "",
                     "dca_line_price": 0.0,
                     "dca_line_source": "N/A",
@@ -2069,80 +2376,86 @@ class CryptoAPITrading:
         except Exception:
             pass
 
+        self._write_current_price_files(price_files)
+
+        # trading_pairs is cached for an hour, so this is no longer an outage guard; entries are gated on
+        # holdings_ok below instead.
         if not trading_pairs:
             return
 
 
 
-        alloc_pct = float(START_ALLOC_PCT or 0.005)
-        allocation_in_usd = total_account_value * (alloc_pct / 100.0)
-        if allocation_in_usd < 0.5:
-            allocation_in_usd = 0.5
-
-
-        holding_full_symbols = [f"{h['asset_code']}-USD" for h in holdings.get("results", [])]
-
-        start_index = 0
-        while start_index < len(crypto_symbols):
-            base_symbol = crypto_symbols[start_index].upper().strip()
-            full_symbol = f"{base_symbol}-USD"
-
-            # Skip if already held
-            if full_symbol in holding_full_symbols:
-                start_index += 1
-                continue
+        # holdings may have been refetched after a trailing sell; if that refetch is not a valid
+        # results list, holdings are unknown again for the entry phase
+        held_results = holdings.get("results", None) if isinstance(holdings, dict) else None
+        if not isinstance(held_results, list):
+            holdings_ok = False
 
-            # Neural signals are used as a "permission to start" gate.
-            buy_count = self._read_long_dca_signal(base_symbol)
-            sell_count = self._read_short_dca_signal(base_symbol)
+        # Only start new trades when this tick's holdings are known (see holdings_ok above)
+        if holdings_ok:
+            held = {str(h.get("asset_code", "")).upper() for h in held_results if isinstance(h, dict)}
 
-            start_level = max(1, min(int(TRADE_START_LEVEL or 3), 7))
-
-            # Default behavior: long must be >= start_level and short must be 0
-            if not (buy_count >= start_level and sell_count == 0):
-                start_index += 1
-                continue
+            alloc_pct = float(START_ALLOC_PCT or 0.005)
+            allocation_in_usd = total_account_value * (alloc_pct / 100.0)
+            if allocation_in_usd < 0.5:
+                allocation_in_usd = 0.5
 
+            # crypto_symbols is already stripped/uppercased by _load_gui_settings
+            for base_symbol in crypto_symbols:
+                # Skip if already held
+                if base_symbol in held:
+                    continue
+                full_symbol = f"{base_symbol}-USD"
 
+                # Neural signals are used as a "permission to start" gate.
+                # Default behavior: long must be >= start_level and short must be 0
+                # (short signal is only read once the long side passes).
+                buy_count = self._read_long_dca_signal(base_symbol)
+                if buy_count < start_level:
+                    continue
+                sell_count = self._read_short_dca_signal(base_symbol)
+                if sell_count != 0:
+                    continue
 
 
 
-            response = self.place_buy_order(
-                str(uuid.uuid4()),
-                "buy",
-                "market",
-                full_symbol,
-                allocation_in_usd,
-            )
 
-            if response and "errors" not in response:
-                trades_made = True
-                # Do NOT pre-trigger any DCA levels. Hardcoded DCA will mark levels only when it hits your loss thresholds.
-                self.dca_levels_triggered[base_symbol] = []
 
-                # Fresh trade -> clear any rolling 24h DCA window for this coin
-                self._reset_dca_window_for_trade(base_symbol, sold=False)
+                response = self.place_buy_order(
+                    str(uuid.uuid4()),
+                    "buy",
+                    "market",
+                    full_symbol,
+                    allocation_in_usd,
+                    current_price=quotes.get(base_symbol, (None, None))[0],
+                )
 
-                # Reset trailing PM state for this coin (fresh trade, fresh trailing logic)
-                self.trailing_pm.pop(base_symbol, None)
+                if response and "errors" not in response:
+                    trades_made = True
+                    traded_assets.add(base_symbol)
+                    # Do NOT pre-trigger any DCA levels. Hardcoded DCA will mark levels only when it hits your loss thresholds.
+                    self.dca_levels_triggered[base_symbol] = 0
 
+                    # Fresh trade -> clear any rolling 24h DCA window for this coin
+                    self._reset_dca_window_for_trade(base_symbol, sold=False)
 
-                print(
-                    f"Starting new trade for {full_symbol} (AI start signal long={buy_count}, short={sell_count}). "
-                    f"Allocating ${allocation_in_usd:.2f}."
-                )
-                time.sleep(5)
-                holdings = self.get_holdings()
-                holding_full_symbols = [f"{h['asset_code']}-USD" for h in holdings.get("results", [])]
+                    # Reset trailing PM state for this coin (fresh trade, fresh trailing logic)
+                    self.trailing_pm.pop(base_symbol, None)
 
 
-            start_index += 1
+                    print(
+                        f"Starting new trade for {full_symbol} (AI start signal long={buy_count}, short={sell_count}). "
+                        f"Allocating ${allocation_in_usd:.2f}."
+                    )
+                    # The buy already waited for a terminal order state; just mark it held.
+                    held.add(base_symbol)
+        else:
+            print("Holdings unavailable this tick (API error); not starting any new trades.")
 
         # If any trades were made, recalculate the cost basis
         if trades_made:
-            time.sleep(5)
             print("Trades were made in this iteration. Recalculating cost basis...")
-            new_cost_basis = self.calculate_cost_basis()
+            new_cost_basis = self.calculate_cost_basis(traded_assets)
             if new_cost_basis:
                 self.cost_basis = new_cost_basis
                 print("Cost basis recalculated successfully.")
@@ -2179,12 +2492,26 @@ class CryptoAPITrading:
 
 
     def run(self):
+        consecutive_errors = 0
+        last_error = None
         while True:
             try:
                 self.manage_trades()
+                consecutive_errors = 0
+                last_error = None
                 time.sleep(0.5)
             except Exception as e:
-                print(traceback.format_exc())
+                consecutive_errors += 1
+                err_sig = (type(e).__name__, str(e))
+                if err_sig != last_error:
+                    # Full traceback once per distinct error; repeats only get a one-line note
+                    print(traceback.format_exc())
+                    last_error = err_sig
+                else:
+                    print(f"Trader loop error repeated ({consecutive_errors}x): {err_sig[0]}: {err_sig[1]}")
+
+                # Back off while the error persists (1s, 2s, 4s ... capped at 30s) instead of spinning
+                time.sleep(min(30.0, 0.5 * (2 ** min(consecutive_errors, 6))))
 
 if __name__ == "__main__":
     trading_bot = CryptoAPITrading()